@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import functools
+import hashlib
+import hmac
+import struct
+import time
 from datetime import timedelta
 
 from fastapi import Cookie, Depends, HTTPException, Response, status
@@ -11,19 +18,53 @@ from app.config import Settings, get_settings
 COOKIE_NAME = "admin_session"
 MAX_AGE_SECONDS = int(timedelta(days=7).total_seconds())
 
+# Token = base64url(issued_at as 8-byte big-endian || HMAC-SHA256(key, issued_at))
+_SALT = b"admin-session"
+_TS = struct.Struct(">Q")
+_TOKEN_BYTES = _TS.size + hashlib.sha256().digest_size
 
-def _serializer(settings: Settings) -> URLSafeTimedSerializer:
+
+def _secret(settings: Settings) -> str:
     if not settings.admin_session_secret:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="ADMIN_SESSION_SECRET is not configured",
         )
-    return URLSafeTimedSerializer(settings.admin_session_secret, salt="admin-session")
+    return settings.admin_session_secret
+
+
+@functools.lru_cache(maxsize=4)
+def _signing_key(secret: str) -> bytes:
+    # Derive a purpose-bound key so the raw secret never signs anything directly.
+    return hmac.new(secret.encode(), _SALT, hashlib.sha256).digest()
+
+
+def _sign(secret: str, ts_bytes: bytes) -> bytes:
+    return hmac.new(_signing_key(secret), ts_bytes, hashlib.sha256).digest()
+
+
+# Legacy itsdangerous cookies (pre-HMAC, see chunk0-16). Remove this fallback on or after
+# 2026-11-01: a cookie lives at most MAX_AGE_SECONDS (7 days), so none issued before the
+# HMAC format shipped can still validate by then.
+@functools.lru_cache(maxsize=4)
+def _legacy_serializer(secret: str) -> URLSafeTimedSerializer:
+    # Keyed on the secret string: Settings itself is not hashable.
+    return URLSafeTimedSerializer(secret, salt="admin-session")
+
+
+def _verify_legacy_token(token: str, *, secret: str) -> None:
+    try:
+        _legacy_serializer(secret).loads(token, max_age=MAX_AGE_SECONDS)
+    except SignatureExpired as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired") from e
+    except BadSignature as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session") from e
 
 
 def set_admin_cookie(response: Response, *, settings: Settings) -> None:
-    s = _serializer(settings)
-    token = s.dumps({"v": 1})
+    ts_bytes = _TS.pack(int(time.time()))
+    mac = _sign(_secret(settings), ts_bytes)
+    token = base64.urlsafe_b64encode(ts_bytes + mac).rstrip(b"=").decode("ascii")
 
     response.set_cookie(
         key=COOKIE_NAME,
@@ -49,14 +90,26 @@ def verify_admin_cookie(
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    s = _serializer(settings)
+    secret = _secret(settings)
+
+    # itsdangerous tokens are dot-separated; base64url never contains "."
+    if "." in token:
+        _verify_legacy_token(token, secret=secret)
+        return
+
     try:
-        s.loads(token, max_age=MAX_AGE_SECONDS)
-    except SignatureExpired as e:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired") from e
-    except BadSignature as e:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError) as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session") from e
 
+    ts_bytes, mac = raw[: _TS.size], raw[_TS.size :]
+    if len(raw) != _TOKEN_BYTES or not hmac.compare_digest(mac, _sign(secret, ts_bytes)):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session")
+
+    (issued_at,) = _TS.unpack(ts_bytes)
+    if time.time() - issued_at > MAX_AGE_SECONDS:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Session expired")
+
 
 def require_admin(
     admin_session: str | None = Cookie(default=None, alias=COOKIE_NAME),
@@ -1,25 +1,56 @@
 from __future__ import annotations
 
-from datetime import datetime, time
+import asyncio
+import functools
+import hmac
+import os
+import tempfile
+from datetime import datetime
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile, status
+import anyio
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
 from pydantic import BaseModel, Field
-from sqlalchemy import delete, select
+from sqlalchemy import Row, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.admin.api_auth import clear_admin_cookie, require_admin, set_admin_cookie
 from app.api.deps import get_bot_manager, get_session
 from app.config import Settings, get_settings
-from app.db.models import Appointment, Master, WorkingHours
-from app.services import booking
-from app.services.media import build_public_url, compress_and_save_image, delete_media_file
+from app.db.models import Appointment, BotSettings, Master, WorkingHours
+from app.services import booking, masters_cache
+from app.services.media import (
+    SavedImage,
+    build_public_url,
+    compress_and_save_image,
+    delete_media_file,
+)
 
 if TYPE_CHECKING:
     from app.bot.manager import BotManager
 
 router = APIRouter(prefix="/admin", tags=["admin"]) 
 
+# Shared cookie-auth dependency for every protected route (cached per request).
+AdminDep = Depends(require_admin)
+
+# 10MB hard limit for upload (before compression)
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+_UPLOAD_CHUNK_BYTES = 64 * 1024
+
 
 class LoginIn(BaseModel):
     password: str
@@ -41,17 +72,73 @@ class MasterOut(BaseModel):
     photo_url: str | None = None
 
 
+_master_fields = attrgetter(
+    "id", "name", "description", "experience_years", "is_active", "photo_path"
+)
+
+
 def _master_out(m: Master, *, settings: Settings) -> MasterOut:
-    return MasterOut(
-        id=m.id,
-        name=m.name,
-        description=m.description,
-        experience_years=m.experience_years,
-        is_active=m.is_active,
-        photo_url=(build_public_url(settings, relative_path=m.photo_path) if m.photo_path else None),
+    # Values come straight from the ORM row, so skip Pydantic validation
+    id_, name, description, experience_years, is_active, photo_path = _master_fields(m)
+    return MasterOut.model_construct(
+        id=id_,
+        name=name,
+        description=description,
+        experience_years=experience_years,
+        is_active=is_active,
+        photo_url=(build_public_url(settings, relative_path=photo_path) if photo_path else None),
     )
 
 
+_compress_sem: asyncio.Semaphore | None = None
+
+
+def _compress_semaphore(settings: Settings) -> asyncio.Semaphore:
+    # Bounds how many worker threads photo compression may occupy at once.
+    global _compress_sem
+    if _compress_sem is None:
+        limit = settings.image_compress_concurrency or max(2, os.cpu_count() or 2)
+        _compress_sem = asyncio.Semaphore(limit)
+    return _compress_sem
+
+
+async def _save_uploaded_photo(
+    file: UploadFile, *, master_id: int, settings: Settings
+) -> SavedImage:
+    src = await _spool_upload(file)
+    with src:
+        async with _compress_semaphore(settings):
+            # Pillow decode/encode is CPU-bound; keep it off the event loop
+            return await anyio.to_thread.run_sync(
+                functools.partial(
+                    compress_and_save_image,
+                    settings,
+                    master_id=master_id,
+                    content_type=file.content_type,
+                    src=src,
+                )
+            )
+
+
+async def _spool_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """Copy upload into a spooled temp file, enforcing the size limit chunk by chunk."""
+    spool = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    total = 0
+    try:
+        while chunk := await file.read(_UPLOAD_CHUNK_BYTES):
+            total += len(chunk)
+            if total > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="File is too large")
+            spool.write(chunk)
+        if not total:
+            raise HTTPException(status_code=400, detail="Empty file")
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
 class WorkingHoursIn(BaseModel):
     day_of_week: int = Field(ge=0, le=6)
     start_time: str
@@ -76,6 +163,23 @@ class MasterWithWorkingHoursOut(BaseModel):
     working_hours: list[WorkingHoursOut] = []
 
 
+def _master_with_hours_out(m: Master, *, settings: Settings) -> MasterWithWorkingHoursOut:
+    # m.working_hours must be eager-loaded (selectinload); the relationship is lazy="raise"
+    return MasterWithWorkingHoursOut.model_construct(
+        **dict(_master_out(m, settings=settings)),
+        working_hours=[
+            WorkingHoursOut.model_construct(
+                id=wh.id,
+                master_id=wh.master_id,
+                day_of_week=wh.day_of_week,
+                start_time=booking.fmt_hm(wh.start_time),
+                end_time=booking.fmt_hm(wh.end_time),
+            )
+            for wh in m.working_hours
+        ],
+    )
+
+
 class AppointmentOut(BaseModel):
     id: int
     master_id: int
@@ -90,7 +194,7 @@ async def login(body: LoginIn, response: Response, settings: Settings = Depends(
     if not settings.admin_panel_password:
         raise HTTPException(status_code=500, detail="ADMIN_PANEL_PASSWORD is not configured")
 
-    if body.password != settings.admin_panel_password:
+    if not hmac.compare_digest(body.password.encode(), settings.admin_panel_password.encode()):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
 
     set_admin_cookie(response, settings=settings)
@@ -103,44 +207,48 @@ async def logout(response: Response, settings: Settings = Depends(get_settings))
     return {"ok": True}
 
 
-@router.get("/me", dependencies=[Depends(require_admin)])
+@router.get("/me", dependencies=[AdminDep])
 async def me() -> dict:
     return {"ok": True}
 
 
-@router.get("/masters", dependencies=[Depends(require_admin)], response_model=list[MasterWithWorkingHoursOut])
+# List endpoints build their output from trusted ORM rows, so they skip FastAPI's
+# response_model re-validation (the schema is still published via `responses`).
+@router.get(
+    "/masters",
+    dependencies=[AdminDep],
+    response_model=None,
+    responses={200: {"model": list[MasterWithWorkingHoursOut]}},
+)
 async def list_masters(
     session: AsyncSession = Depends(get_session),
     settings: Settings = Depends(get_settings),
 ) -> list[MasterWithWorkingHoursOut]:
-    from sqlalchemy.orm import selectinload
     rows = (await session.execute(
         select(Master).options(selectinload(Master.working_hours)).order_by(Master.id)
-    )).scalars().all()
-    return [
-        MasterWithWorkingHoursOut(
-            id=m.id,
-            name=m.name,
-            description=m.description,
-            experience_years=m.experience_years,
-            is_active=m.is_active,
-            photo_url=(build_public_url(settings, relative_path=m.photo_path) if m.photo_path else None),
-            working_hours=[
-                WorkingHoursOut(
-                    id=wh.id,
-                    master_id=wh.master_id,
-                    day_of_week=wh.day_of_week,
-                    start_time=wh.start_time.strftime("%H:%M"),
-                    end_time=wh.end_time.strftime("%H:%M"),
-                )
-                for wh in m.working_hours
-            ],
-        )
-        for m in rows
-    ]
+    )).scalars()
+    return [_master_with_hours_out(m, settings=settings) for m in rows]
+
+
+@router.get(
+    "/masters/{master_id}",
+    dependencies=[AdminDep],
+    response_model=MasterWithWorkingHoursOut,
+)
+async def get_master(
+    master_id: int,
+    session: AsyncSession = Depends(get_session),
+    settings: Settings = Depends(get_settings),
+) -> MasterWithWorkingHoursOut:
+    m = (await session.execute(
+        select(Master).options(selectinload(Master.working_hours)).where(Master.id == master_id)
+    )).scalar_one_or_none()
+    if not m:
+        raise HTTPException(status_code=404, detail="Master not found")
+    return _master_with_hours_out(m, settings=settings)
 
 
-@router.post("/masters", dependencies=[Depends(require_admin)], response_model=MasterOut, status_code=201)
+@router.post("/masters", dependencies=[AdminDep], response_model=MasterOut, status_code=201)
 async def create_master(
     name: str = Form(...),
     description: str | None = Form(None),
@@ -158,29 +266,18 @@ async def create_master(
     )
     session.add(m)
     await session.commit()
-    await session.refresh(m)
+    masters_cache.invalidate()
 
     if file is not None:
-        raw = await file.read()
-        if not raw:
-            raise HTTPException(status_code=400, detail="Empty file")
-        if len(raw) > 10 * 1024 * 1024:
-            raise HTTPException(status_code=400, detail="File is too large")
-
-        saved = compress_and_save_image(
-            settings,
-            master_id=m.id,
-            content_type=file.content_type,
-            raw=raw,
-        )
+        saved = await _save_uploaded_photo(file, master_id=m.id, settings=settings)
         m.photo_path = saved.relative_path
         await session.commit()
-        await session.refresh(m)
+        masters_cache.invalidate()
 
     return _master_out(m, settings=settings)
 
 
-@router.patch("/masters/{master_id}", dependencies=[Depends(require_admin)], response_model=MasterOut)
+@router.patch("/masters/{master_id}", dependencies=[AdminDep], response_model=MasterOut)
 async def update_master(
     master_id: int,
     body: MasterIn,
@@ -197,36 +294,41 @@ async def update_master(
     m.is_active = body.is_active
 
     await session.commit()
-    await session.refresh(m)
+    masters_cache.invalidate()
     return _master_out(m, settings=settings)
 
 
-@router.delete("/masters/{master_id}", dependencies=[Depends(require_admin)])
+@router.delete("/masters/{master_id}", dependencies=[AdminDep])
 async def delete_master(
     master_id: int,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
     settings: Settings = Depends(get_settings),
 ) -> dict:
-    m = await session.get(Master, master_id)
-    if not m:
+    row = (
+        await session.execute(
+            delete(Master).where(Master.id == master_id).returning(Master.photo_path)
+        )
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Master not found")
-
-    # best-effort delete photo file
-    if m.photo_path:
-        delete_media_file(settings, relative_path=m.photo_path)
-
-    await session.delete(m)
     await session.commit()
+    masters_cache.invalidate()
+
+    # best-effort delete photo file, after the response is sent
+    if row.photo_path:
+        background_tasks.add_task(delete_media_file, settings, relative_path=row.photo_path)
     return {"ok": True}
 
 
 @router.put(
     "/masters/{master_id}/photo",
-    dependencies=[Depends(require_admin)],
+    dependencies=[AdminDep],
     response_model=MasterOut,
 )
 async def upload_master_photo(
     master_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     session: AsyncSession = Depends(get_session),
     settings: Settings = Depends(get_settings),
@@ -235,36 +337,25 @@ async def upload_master_photo(
     if not m:
         raise HTTPException(status_code=404, detail="Master not found")
 
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(status_code=400, detail="Empty file")
-    # 10MB hard limit for upload (before compression)
-    if len(raw) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File is too large")
-
-    saved = compress_and_save_image(
-        settings,
-        master_id=master_id,
-        content_type=file.content_type,
-        raw=raw,
-    )
+    saved = await _save_uploaded_photo(file, master_id=master_id, settings=settings)
 
     # If there was a previous photo under another path, delete it
     if m.photo_path and m.photo_path != saved.relative_path:
-        delete_media_file(settings, relative_path=m.photo_path)
+        background_tasks.add_task(delete_media_file, settings, relative_path=m.photo_path)
 
     m.photo_path = saved.relative_path
     await session.commit()
-    await session.refresh(m)
+    masters_cache.invalidate()
     return _master_out(m, settings=settings)
 
 
 @router.delete(
     "/masters/{master_id}/photo",
-    dependencies=[Depends(require_admin)],
+    dependencies=[AdminDep],
 )
 async def delete_master_photo(
     master_id: int,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
     settings: Settings = Depends(get_settings),
 ) -> dict:
@@ -273,35 +364,34 @@ async def delete_master_photo(
         raise HTTPException(status_code=404, detail="Master not found")
 
     if m.photo_path:
-        delete_media_file(settings, relative_path=m.photo_path)
+        background_tasks.add_task(delete_media_file, settings, relative_path=m.photo_path)
         m.photo_path = None
         await session.commit()
+        masters_cache.invalidate()
 
     return {"ok": True}
 
 
 @router.get(
     "/masters/{master_id}/working-hours",
-    dependencies=[Depends(require_admin)],
+    dependencies=[AdminDep],
     response_model=list[WorkingHoursIn],
 )
 async def get_working_hours(master_id: int, session: AsyncSession = Depends(get_session)) -> list[WorkingHoursIn]:
     rows = (
-        (await session.execute(select(WorkingHours).where(WorkingHours.master_id == master_id)))
-        .scalars()
-        .all()
-    )
+        await session.execute(select(WorkingHours).where(WorkingHours.master_id == master_id))
+    ).scalars()
     return [
         WorkingHoursIn(
             day_of_week=r.day_of_week,
-            start_time=r.start_time.strftime("%H:%M"),
-            end_time=r.end_time.strftime("%H:%M"),
+            start_time=booking.fmt_hm(r.start_time),
+            end_time=booking.fmt_hm(r.end_time),
         )
         for r in rows
     ]
 
 
-@router.put("/masters/{master_id}/working-hours", dependencies=[Depends(require_admin)])
+@router.put("/masters/{master_id}/working-hours", dependencies=[AdminDep])
 async def set_working_hours(
     master_id: int, body: list[WorkingHoursIn], session: AsyncSession = Depends(get_session)
 ) -> dict:
@@ -309,35 +399,60 @@ async def set_working_hours(
     if not m:
         raise HTTPException(status_code=404, detail="Master not found")
 
-    await session.execute(delete(WorkingHours).where(WorkingHours.master_id == master_id))
-
-    def parse_hm(s: str) -> time:
-        hh, mm = s.split(":")
-        return time(hour=int(hh), minute=int(mm))
-
-    for wh in body:
-        session.add(
-            WorkingHours(
-                master_id=master_id,
-                day_of_week=wh.day_of_week,
-                start_time=parse_hm(wh.start_time),
-                end_time=parse_hm(wh.end_time),
-            )
-        )
+    await booking.replace_working_hours(
+        session,
+        master_id=master_id,
+        hours=[
+            (wh.day_of_week, booking.parse_hm(wh.start_time), booking.parse_hm(wh.end_time))
+            for wh in body
+        ],
+    )
 
     await session.commit()
     return {"ok": True}
 
 
-@router.get("/appointments", dependencies=[Depends(require_admin)], response_model=list[AppointmentOut])
+@router.get(
+    "/appointments",
+    dependencies=[AdminDep],
+    response_model=None,
+    responses={
+        200: {
+            "model": list[AppointmentOut],
+            "headers": {
+                "X-Has-More": {
+                    "description": "\"true\" if another page follows (offset + limit)",
+                    "schema": {"type": "string", "enum": ["true", "false"]},
+                }
+            },
+        }
+    },
+)
 async def list_appointments(
+    response: Response,
     master_id: int | None = None,
     customer_telegram_id: int | None = None,
     from_dt: datetime | None = None,
     to_dt: datetime | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     session: AsyncSession = Depends(get_session),
 ) -> list[AppointmentOut]:
-    stmt = select(Appointment).order_by(Appointment.start_at)
+    # id as tie-breaker keeps pages stable for appointments sharing start_at
+    stmt = (
+        select(
+            Appointment.id,
+            Appointment.master_id,
+            Appointment.customer_telegram_id,
+            Appointment.start_at,
+            Appointment.end_at,
+            Appointment.status,
+        )
+        .order_by(Appointment.start_at, Appointment.id)
+        # One extra row tells us whether another page exists
+        .limit(limit + 1)
+        .offset(offset)
+    )
     if master_id is not None:
         stmt = stmt.where(Appointment.master_id == master_id)
     if customer_telegram_id is not None:
@@ -347,9 +462,10 @@ async def list_appointments(
     if to_dt is not None:
         stmt = stmt.where(Appointment.start_at < to_dt)
 
-    rows = (await session.execute(stmt)).scalars().all()
+    rows = (await session.execute(stmt)).all()
+    response.headers["X-Has-More"] = "true" if len(rows) > limit else "false"
     return [
-        AppointmentOut(
+        AppointmentOut.model_construct(
             id=a.id,
             master_id=a.master_id,
             customer_telegram_id=a.customer_telegram_id,
@@ -357,13 +473,13 @@ async def list_appointments(
             end_at=a.end_at,
             status=a.status.value,
         )
-        for a in rows
+        for a in rows[:limit]
     ]
 
 
 @router.post(
     "/appointments/{appointment_id}/cancel",
-    dependencies=[Depends(require_admin)],
+    dependencies=[AdminDep],
     response_model=AppointmentOut,
 )
 async def cancel_appt(appointment_id: int, session: AsyncSession = Depends(get_session)) -> AppointmentOut:
@@ -412,11 +528,13 @@ class BotSettingsOut(BaseModel):
     token_from_db: bool
 
 
-@router.get("/bot/status", dependencies=[Depends(require_admin)], response_model=BotStatusOut)
-async def get_bot_status(
-    bot_manager: "BotManager" = Depends(get_bot_manager),
-) -> BotStatusOut:
-    """Get current bot status."""
+class BotOverviewOut(BaseModel):
+    status: BotStatusOut
+    settings: BotSettingsOut
+    last_log: BotLogOut | None = None
+
+
+def _bot_status_out(bot_manager: "BotManager") -> BotStatusOut:
     state = bot_manager.state
     return BotStatusOut(
         status=state.status.value,
@@ -426,16 +544,10 @@ async def get_bot_status(
     )
 
 
-@router.get("/bot/settings", dependencies=[Depends(require_admin)], response_model=BotSettingsOut)
-async def get_bot_settings(
-    bot_manager: "BotManager" = Depends(get_bot_manager),
-    settings: Settings = Depends(get_settings),
-) -> BotSettingsOut:
-    """Get bot settings info."""
-    db_settings = await bot_manager.get_bot_settings()
+def _bot_settings_out(db_settings: BotSettings | None, *, settings: Settings) -> BotSettingsOut:
     has_db_token = db_settings is not None and db_settings.bot_token is not None
     has_env_token = bool(settings.bot_token)
-    
+
     return BotSettingsOut(
         is_enabled=db_settings.is_enabled if db_settings else True,
         has_token=has_db_token or has_env_token,
@@ -443,26 +555,63 @@ async def get_bot_settings(
     )
 
 
-@router.get("/bot/logs", dependencies=[Depends(require_admin)], response_model=list[BotLogOut])
+def _bot_log_out(log: Row) -> BotLogOut:
+    return BotLogOut.model_construct(
+        id=log.id,
+        level=log.level.value,
+        message=log.message,
+        details=log.details,
+        created_at=log.created_at,
+    )
+
+
+@router.get("/bot/status", dependencies=[AdminDep], response_model=BotStatusOut)
+async def get_bot_status(
+    bot_manager: "BotManager" = Depends(get_bot_manager),
+) -> BotStatusOut:
+    """Get current bot status."""
+    return _bot_status_out(bot_manager)
+
+
+@router.get("/bot/settings", dependencies=[AdminDep], response_model=BotSettingsOut)
+async def get_bot_settings(
+    bot_manager: "BotManager" = Depends(get_bot_manager),
+    settings: Settings = Depends(get_settings),
+) -> BotSettingsOut:
+    """Get bot settings info."""
+    db_settings = await bot_manager.get_bot_settings()
+    return _bot_settings_out(db_settings, settings=settings)
+
+
+@router.get("/bot/overview", dependencies=[AdminDep], response_model=BotOverviewOut)
+async def get_bot_overview(
+    bot_manager: "BotManager" = Depends(get_bot_manager),
+    settings: Settings = Depends(get_settings),
+) -> BotOverviewOut:
+    """Get status, settings and the latest log entry for the dashboard."""
+    # Independent reads (each opens its own session): fan out instead of awaiting in turn.
+    db_settings, recent_logs = await asyncio.gather(
+        bot_manager.get_bot_settings(),
+        bot_manager.get_logs(limit=1),
+    )
+    return BotOverviewOut(
+        status=_bot_status_out(bot_manager),
+        settings=_bot_settings_out(db_settings, settings=settings),
+        last_log=_bot_log_out(recent_logs[0]) if recent_logs else None,
+    )
+
+
+@router.get("/bot/logs", dependencies=[AdminDep], response_model=list[BotLogOut])
 async def get_bot_logs(
     limit: int = 50,
     bot_manager: "BotManager" = Depends(get_bot_manager),
 ) -> list[BotLogOut]:
     """Get recent bot logs."""
     logs = await bot_manager.get_logs(limit=min(limit, 200))
-    return [
-        BotLogOut(
-            id=log.id,
-            level=log.level.value,
-            message=log.message,
-            details=log.details,
-            created_at=log.created_at,
-        )
-        for log in logs
-    ]
+    return [_bot_log_out(log) for log in logs]
 
 
-@router.post("/bot/token", dependencies=[Depends(require_admin)])
+@router.post("/bot/token", dependencies=[AdminDep])
 async def update_bot_token(
     body: BotTokenIn,
     bot_manager: "BotManager" = Depends(get_bot_manager),
@@ -477,7 +626,7 @@ async def update_bot_token(
     }
 
 
-@router.post("/bot/restart", dependencies=[Depends(require_admin)])
+@router.post("/bot/restart", dependencies=[AdminDep])
 async def restart_bot(
     bot_manager: "BotManager" = Depends(get_bot_manager),
 ) -> dict:
@@ -490,7 +639,7 @@ async def restart_bot(
     }
 
 
-@router.post("/bot/stop", dependencies=[Depends(require_admin)])
+@router.post("/bot/stop", dependencies=[AdminDep])
 async def stop_bot(
     bot_manager: "BotManager" = Depends(get_bot_manager),
 ) -> dict:
@@ -502,7 +651,7 @@ async def stop_bot(
     }
 
 
-@router.post("/bot/start", dependencies=[Depends(require_admin)])
+@router.post("/bot/start", dependencies=[AdminDep])
 async def start_bot(
     bot_manager: "BotManager" = Depends(get_bot_manager),
 ) -> dict:
@@ -515,7 +664,7 @@ async def start_bot(
     }
 
 
-@router.post("/bot/enable", dependencies=[Depends(require_admin)])
+@router.post("/bot/enable", dependencies=[AdminDep])
 async def enable_bot(
     enabled: bool = True,
     bot_manager: "BotManager" = Depends(get_bot_manager),
@@ -1,27 +1,87 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from app.admin.router import router as admin_router
 from app.api.routers.make import router as make_router
+from app.api.routers.telegram import router as telegram_router
+from app.api.static import CachedStaticFiles
 from app.bot.manager import BotManager
-from app.config import get_settings
+from app.config import Settings, get_settings
 from app.db.models import Admin, Base
-from app.db.session import create_engine, create_session_factory
+from app.db.session import create_engine, create_session_factory, prewarm_pool
+
+
+async def _bootstrap_admins(
+    settings: Settings, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    if not settings.admin_ids:
+        return
+    async with session_factory() as session:
+        stmt = select(Admin.telegram_id).where(Admin.telegram_id.in_(list(settings.admin_ids)))
+        existing = set(await session.scalars(stmt))
+        session.add_all([Admin(telegram_id=t) for t in settings.admin_ids if t not in existing])
+        await session.commit()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings: Settings = app.state.settings
+    engine: AsyncEngine = app.state.engine
+    bot_manager: BotManager = app.state.bot_manager
+
+    # Ensure media directories exist
+    os.makedirs(settings.media_root, exist_ok=True)
+    os.makedirs(os.path.join(settings.media_root, "masters"), exist_ok=True)
+
+    # For local/dev convenience. In prod the schema comes from alembic migrations.
+    if settings.env != "prod":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Independent of each other once the schema exists
+    startup = [
+        prewarm_pool(engine, min(settings.db_pool_prewarm, settings.db_pool_size)),
+        _bootstrap_admins(settings, app.state.session_factory),
+    ]
+    if settings.enable_bot:
+        startup.append(bot_manager.start())
+    await asyncio.gather(*startup)
+
+    try:
+        yield
+    finally:
+        await bot_manager.shutdown()
+        await engine.dispose()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
 
-    engine = create_engine(settings.database_url)
+    engine = create_engine(
+        settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_s,
+        pool_timeout=settings.db_pool_timeout_s,
+        pool_use_lifo=settings.db_pool_use_lifo,
+    )
     session_factory = create_session_factory(engine)
 
-    app = FastAPI(title="Barbershop Telegram Backend")
+    app = FastAPI(
+        title="Barbershop Telegram Backend",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
     app.state.settings = settings
 
     cors_origins = [o.strip() for o in settings.admin_cors_origins.split(",") if o.strip()]
@@ -47,42 +107,16 @@ def create_app() -> FastAPI:
     # Public media (master photos)
     app.mount(
         settings.media_url_prefix,
-        StaticFiles(directory=settings.media_root),
+        CachedStaticFiles(directory=settings.media_root),
         name="media",
     )
 
     app.include_router(make_router)
+    app.include_router(telegram_router)
     app.include_router(admin_router)
 
     @app.get("/health")
     async def health() -> dict:
         return {"ok": True}
 
-    @app.on_event("startup")
-    async def on_startup() -> None:
-        # Ensure media directories exist
-        os.makedirs(settings.media_root, exist_ok=True)
-        os.makedirs(os.path.join(settings.media_root, "masters"), exist_ok=True)
-
-        # For local/dev convenience. In prod prefer alembic migrations.
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-
-        # Bootstrap admins
-        async with session_factory() as session:
-            for tg_id in settings.admin_ids:
-                exists = await session.scalar(select(Admin.id).where(Admin.telegram_id == tg_id).limit(1))
-                if not exists:
-                    session.add(Admin(telegram_id=tg_id))
-            await session.commit()
-
-        # Start bot if enabled
-        if settings.enable_bot:
-            await bot_manager.start()
-
-    @app.on_event("shutdown")
-    async def on_shutdown() -> None:
-        await bot_manager.shutdown()
-        await engine.dispose()
-
     return app
@@ -1,21 +1,27 @@
 from __future__ import annotations
 
-from datetime import datetime, time
+from datetime import datetime
+from typing import TYPE_CHECKING
 
+import orjson
 from aiogram import Bot
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
-from sqlalchemy import delete, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_bot, get_session
+from app.api.deps import get_bot, get_bot_manager, get_session
 from app.bot.sender import send_text
 from app.db.models import Appointment, MakeRequest, MakeRequestStatus, Master, WorkingHours
-from app.services import booking
+from app.services import booking, masters_cache
 from app.services.auth import admin_auth, make_auth
 from app.config import Settings, get_settings
 from app.services.media import build_public_url
 
+if TYPE_CHECKING:
+    from app.bot.manager import BotManager
+
 router = APIRouter(prefix="/make", tags=["make"])
 
 
@@ -24,6 +30,10 @@ class CallbackIn(BaseModel):
     text: str
 
 
+# make_callback is the busiest endpoint: validate the raw body in one pass
+_CALLBACK_ADAPTER = TypeAdapter(CallbackIn)
+
+
 class MasterOut(BaseModel):
     id: int
     name: str
@@ -72,22 +82,47 @@ class AppointmentOut(BaseModel):
     status: str
 
 
-@router.post("/callback", dependencies=[Depends(make_auth)])
+@router.post(
+    "/callback",
+    dependencies=[Depends(make_auth)],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _CALLBACK_ADAPTER.json_schema()}},
+        }
+    },
+)
 async def make_callback(
-    body: CallbackIn,
+    request: Request,
     session: AsyncSession = Depends(get_session),
     bot: Bot = Depends(get_bot),
+    bot_manager: "BotManager" = Depends(get_bot_manager),
 ) -> dict:
-    req = (
-        (await session.execute(select(MakeRequest).where(MakeRequest.correlation_id == body.correlation_id)))
-        .scalars()
-        .first()
+    try:
+        body = _CALLBACK_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        errors = [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+        raise RequestValidationError(errors) from e
+
+    # Not popped: Make may send several replies for one message until the entry expires
+    entry = bot_manager.correlations.get(body.correlation_id)
+    if entry is not None:
+        await send_text(bot, chat_id=entry.chat_id, text=body.text)
+        return {"ok": True}
+
+    # Not cached here (forwarded before a restart, or by another process): the row the
+    # forwarder wrote before sending is authoritative.
+    # Lookup and status update in one statement; rolled back if the send fails.
+    chat_id = await session.scalar(
+        update(MakeRequest)
+        .where(MakeRequest.correlation_id == body.correlation_id)
+        .values(status=MakeRequestStatus.completed)
+        .returning(MakeRequest.chat_id)
     )
-    if not req:
+    if chat_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown correlation_id")
 
-    await send_text(bot, chat_id=req.chat_id, text=body.text)
-    req.status = MakeRequestStatus.completed
+    await send_text(bot, chat_id=chat_id, text=body.text)
     await session.commit()
     return {"ok": True}
 
@@ -95,6 +130,11 @@ async def make_callback(
 # --- Admin-only: masters + working hours ---
 
 
+def _fmt_dt(dt: datetime) -> str:
+    # Same "Z" suffix pydantic emits for UTC in the AppointmentOut responses
+    return dt.isoformat().replace("+00:00", "Z")
+
+
 @router.post("/masters", dependencies=[Depends(admin_auth)], response_model=MasterOut)
 async def create_master(
     body: MasterCreateIn,
@@ -109,7 +149,7 @@ async def create_master(
     )
     session.add(m)
     await session.commit()
-    await session.refresh(m)
+    masters_cache.invalidate()
     return MasterOut(
         id=m.id,
         name=m.name,
@@ -120,32 +160,51 @@ async def create_master(
     )
 
 
-@router.get("/masters", dependencies=[Depends(make_auth)], response_model=list[MasterOut])
+# List endpoints return plain dicts built from trusted ORM rows, so they skip model
+# construction and FastAPI's response_model re-validation; ORJSONResponse serializes
+# them directly (the schema is still published via `responses`).
+@router.get(
+    "/masters",
+    dependencies=[Depends(make_auth)],
+    response_model=None,
+    responses={200: {"model": list[MasterOut]}},
+)
 async def list_masters(
     session: AsyncSession = Depends(get_session),
     settings: Settings = Depends(get_settings),
-) -> list[MasterOut]:
-    ms = (await session.execute(select(Master).order_by(Master.id))).scalars().all()
-    return [
-        MasterOut(
-            id=m.id,
-            name=m.name,
-            description=m.description,
-            experience_years=m.experience_years,
-            is_active=m.is_active,
-            photo_url=(build_public_url(settings, relative_path=m.photo_path) if m.photo_path else None),
+) -> Response:
+    body = masters_cache.get()
+    if body is None:
+        generation = masters_cache.generation()
+        # Same URL as build_public_url(), without a call per row
+        url_prefix = settings.media_base_url + "/"
+        ms = (await session.execute(select(Master).order_by(Master.id))).scalars()
+        body = orjson.dumps(
+            [
+                {
+                    "id": m.id,
+                    "name": m.name,
+                    "description": m.description,
+                    "experience_years": m.experience_years,
+                    "is_active": m.is_active,
+                    "photo_url": url_prefix + m.photo_path.lstrip("/") if m.photo_path else None,
+                }
+                for m in ms
+            ]
         )
-        for m in ms
-    ]
+        masters_cache.put(body, generation=generation)
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/masters/{master_id}", dependencies=[Depends(admin_auth)])
 async def delete_master(master_id: int, session: AsyncSession = Depends(get_session)) -> dict:
-    m = await session.get(Master, master_id)
-    if not m:
+    deleted_id = await session.scalar(
+        delete(Master).where(Master.id == master_id).returning(Master.id)
+    )
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Master not found")
-    await session.delete(m)
     await session.commit()
+    masters_cache.invalidate()
     return {"ok": True}
 
 
@@ -157,21 +216,14 @@ async def set_working_hours(
     if not m:
         raise HTTPException(status_code=404, detail="Master not found")
 
-    await session.execute(delete(WorkingHours).where(WorkingHours.master_id == master_id))
-
-    def parse_hm(s: str) -> time:
-        hh, mm = s.split(":")
-        return time(hour=int(hh), minute=int(mm))
-
-    for wh in body:
-        session.add(
-            WorkingHours(
-                master_id=master_id,
-                day_of_week=wh.day_of_week,
-                start_time=parse_hm(wh.start_time),
-                end_time=parse_hm(wh.end_time),
-            )
-        )
+    await booking.replace_working_hours(
+        session,
+        master_id=master_id,
+        hours=[
+            (wh.day_of_week, booking.parse_hm(wh.start_time), booking.parse_hm(wh.end_time))
+            for wh in body
+        ],
+    )
 
     await session.commit()
     return {"ok": True}
@@ -180,23 +232,22 @@ async def set_working_hours(
 @router.get(
     "/masters/{master_id}/working-hours",
     dependencies=[Depends(make_auth)],
-    response_model=list[WorkingHoursOut],
+    response_model=None,
+    responses={200: {"model": list[WorkingHoursOut]}},
 )
 async def get_working_hours(
     master_id: int,
     session: AsyncSession = Depends(get_session),
-) -> list[WorkingHoursOut]:
+) -> list[dict]:
     rows = (
-        (await session.execute(select(WorkingHours).where(WorkingHours.master_id == master_id)))
-        .scalars()
-        .all()
-    )
+        await session.execute(select(WorkingHours).where(WorkingHours.master_id == master_id))
+    ).scalars()
     return [
-        WorkingHoursOut(
-            day_of_week=r.day_of_week,
-            start_time=r.start_time.strftime("%H:%M"),
-            end_time=r.end_time.strftime("%H:%M"),
-        )
+        {
+            "day_of_week": r.day_of_week,
+            "start_time": booking.fmt_hm(r.start_time),
+            "end_time": booking.fmt_hm(r.end_time),
+        }
         for r in rows
     ]
 
@@ -288,15 +339,47 @@ async def cancel(appointment_id: int, session: AsyncSession = Depends(get_sessio
         raise HTTPException(status_code=404, detail=str(e)) from e
 
 
-@router.get("/appointments", dependencies=[Depends(make_auth)], response_model=list[AppointmentOut])
+@router.get(
+    "/appointments",
+    dependencies=[Depends(make_auth)],
+    response_model=None,
+    responses={
+        200: {
+            "model": list[AppointmentOut],
+            "headers": {
+                "X-Has-More": {
+                    "description": "\"true\" if another page follows (offset + limit)",
+                    "schema": {"type": "string", "enum": ["true", "false"]},
+                }
+            },
+        }
+    },
+)
 async def list_appointments(
+    response: Response,
     master_id: int | None = None,
     customer_telegram_id: int | None = None,
     from_dt: datetime | None = None,
     to_dt: datetime | None = None,
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     session: AsyncSession = Depends(get_session),
-) -> list[AppointmentOut]:
-    stmt = select(Appointment).order_by(Appointment.start_at)
+) -> list[dict]:
+    # id as tie-breaker keeps pages stable for appointments sharing start_at
+    stmt = (
+        select(
+            Appointment.id,
+            Appointment.master_id,
+            Appointment.customer_telegram_id,
+            Appointment.start_at,
+            Appointment.end_at,
+            Appointment.status,
+        )
+        .order_by(Appointment.start_at, Appointment.id)
+        # One extra row tells us whether another page exists
+        .limit(limit + 1)
+        .offset(offset)
+    )
     if master_id is not None:
         stmt = stmt.where(Appointment.master_id == master_id)
     if customer_telegram_id is not None:
@@ -306,15 +389,16 @@ async def list_appointments(
     if to_dt is not None:
         stmt = stmt.where(Appointment.start_at < to_dt)
 
-    rows = (await session.execute(stmt)).scalars().all()
+    rows = (await session.execute(stmt)).all()
+    response.headers["X-Has-More"] = "true" if len(rows) > limit else "false"
     return [
-        AppointmentOut(
-            id=a.id,
-            master_id=a.master_id,
-            customer_telegram_id=a.customer_telegram_id,
-            start_at=a.start_at,
-            end_at=a.end_at,
-            status=a.status.value,
-        )
-        for a in rows
+        {
+            "id": a.id,
+            "master_id": a.master_id,
+            "customer_telegram_id": a.customer_telegram_id,
+            "start_at": _fmt_dt(a.start_at),
+            "end_at": _fmt_dt(a.end_at),
+            "status": a.status.value,
+        }
+        for a in rows[:limit]
     ]
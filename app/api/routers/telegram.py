@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import hmac
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+
+from app.api.deps import get_bot_manager
+from app.config import Settings, get_settings
+
+if TYPE_CHECKING:
+    from app.bot.manager import BotManager
+
+router = APIRouter(prefix="/tg", tags=["telegram"])
+
+
+@router.post("/webhook", include_in_schema=False)
+async def telegram_webhook(
+    request: Request,
+    x_telegram_bot_api_secret_token: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings),
+    bot_manager: "BotManager" = Depends(get_bot_manager),
+) -> dict:
+    if not settings.tg_use_webhook:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not settings.tg_webhook_secret:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="TG_WEBHOOK_SECRET is not configured",
+        )
+    if not x_telegram_bot_api_secret_token or not hmac.compare_digest(
+        x_telegram_bot_api_secret_token.encode(), settings.tg_webhook_secret.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid secret token")
+
+    # Non-2xx makes Telegram redeliver the update later
+    if not await bot_manager.feed_webhook_update(await request.json()):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Bot is not running"
+        )
+    return {"ok": True}
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import FileResponse, Response
+from starlette.types import Scope
+
+# Content-addressed media names end with "-{sha1[:12]}.{ext}" (see compress_and_save_image)
+_HASHED_NAME = re.compile(r"-[0-9a-f]{12}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+
+MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MEMORY_CACHE_MAX_FILE_BYTES = 512 * 1024
+
+
+class _FileBytesCache:
+    """Bounded LRU of small file contents, keyed by path and validated by (mtime_ns, size).
+
+    Only touched from the event loop, so no locking.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._total = 0
+        self._entries: OrderedDict[str, tuple[int, int, bytes]] = OrderedDict()
+
+    def get(self, path: str, st: os.stat_result) -> bytes | None:
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            self._evict(path)
+            return None
+        self._entries.move_to_end(path)
+        return entry[2]
+
+    def put(self, path: str, st: os.stat_result, data: bytes) -> None:
+        if path in self._entries:
+            self._evict(path)
+        self._entries[path] = (st.st_mtime_ns, st.st_size, data)
+        self._total += len(data)
+        while self._total > self._max_bytes:
+            _, (_, _, old) = self._entries.popitem(last=False)
+            self._total -= len(old)
+
+    def _evict(self, path: str) -> None:
+        _, _, data = self._entries.pop(path)
+        self._total -= len(data)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that adds Cache-Control to file responses.
+
+    Content-addressed files never change under the same URL, so clients may cache them
+    forever; anything else gets a short max-age and revalidates via ETag/Last-Modified.
+
+    Small files are also served from an in-memory LRU instead of being re-read from disk
+    on every hit. StaticFiles still stats the file, so changed or deleted files are never
+    served stale.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._memory_cache = _FileBytesCache(max_bytes=MEMORY_CACHE_MAX_BYTES)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if (
+            not isinstance(response, FileResponse)
+            or response.stat_result is None
+            or response.stat_result.st_size > MEMORY_CACHE_MAX_FILE_BYTES
+            or scope["method"] != "GET"
+            or any(k == b"range" for k, _ in scope["headers"])
+        ):
+            return response
+
+        full_path = os.fspath(response.path)
+        st = response.stat_result
+        data = self._memory_cache.get(full_path, st)
+        if data is None:
+            data = await anyio.Path(full_path).read_bytes()
+            if len(data) != st.st_size:
+                # Replaced between stat and read; let FileResponse stream it
+                return response
+            self._memory_cache.put(full_path, st, data)
+
+        # Headers (content-type/length, ETag, Last-Modified, Cache-Control) carry over
+        return Response(content=data, status_code=response.status_code, headers=response.headers)
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if _HASHED_NAME.search(os.fspath(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return response
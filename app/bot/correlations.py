@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+# Make may reply to a message for this long after it was forwarded
+CORRELATION_TTL_S = 3600.0
+_PRUNE_INTERVAL_S = 60.0
+
+
+@dataclass(frozen=True)
+class CorrelationEntry:
+    chat_id: int
+    created_at: float  # time.monotonic()
+
+
+class CorrelationStore:
+    """In-process map of correlation_id -> originating chat for Make callbacks.
+
+    A read-through cache in front of the make_requests rows the forwarder writes: it
+    saves the DB lookup on callbacks, but is lost on restart, so the rows stay the
+    source of truth. Entries expire after CORRELATION_TTL_S; expired ones are pruned
+    lazily on insert, so no janitor task is needed.
+    """
+
+    def __init__(self, *, ttl_s: float = CORRELATION_TTL_S) -> None:
+        self._ttl_s = ttl_s
+        self._entries: dict[str, CorrelationEntry] = {}
+        self._next_prune_at = time.monotonic() + _PRUNE_INTERVAL_S
+
+    def add(self, correlation_id: str, *, chat_id: int) -> None:
+        now = time.monotonic()
+        if now >= self._next_prune_at:
+            self.prune(now)
+        self._entries[correlation_id] = CorrelationEntry(chat_id=chat_id, created_at=now)
+
+    def get(self, correlation_id: str) -> CorrelationEntry | None:
+        entry = self._entries.get(correlation_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self._ttl_s:
+            del self._entries[correlation_id]
+            return None
+        return entry
+
+    def discard(self, correlation_id: str) -> None:
+        self._entries.pop(correlation_id, None)
+
+    def prune(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        cutoff = now - self._ttl_s
+        expired = [cid for cid, e in self._entries.items() if e.created_at < cutoff]
+        for cid in expired:
+            del self._entries[cid]
+        self._next_prune_at = now + _PRUNE_INTERVAL_S
@@ -1,22 +1,168 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import logging
 import uuid
 from datetime import datetime, timezone
 
-from aiogram import Bot, Dispatcher, F
+from aiogram import Dispatcher, F
 from aiogram.types import Message
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.bot.correlations import CorrelationStore
 from app.bot.make_client import MakeClient
 from app.db.models import MakeRequest, MakeRequestStatus
 
+logger = logging.getLogger(__name__)
+
+# Telegram bursts are absorbed by the queue; the worker count caps concurrent Make requests.
+SEND_QUEUE_MAXSIZE = 1000
+SEND_WORKERS = 16
+# On stop, wait this long for queued/in-flight sends before cancelling the workers
+STOP_DRAIN_TIMEOUT_S = 5.0
+
+
+class MakeForwarder:
+    """Bounded queue drained by a fixed pool of workers that POST messages to Make."""
+
+    def __init__(
+        self,
+        *,
+        make_client: MakeClient,
+        session_factory: async_sessionmaker,
+        correlations: CorrelationStore,
+        workers: int = SEND_WORKERS,
+        maxsize: int = SEND_QUEUE_MAXSIZE,
+    ) -> None:
+        self._make_client = make_client
+        self._session_factory = session_factory
+        self._correlations = correlations
+        self._workers = workers
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self._tasks: list[asyncio.Task] = []
+        # correlation_id -> payload currently being sent by a worker
+        self._in_flight: dict[str, dict] = {}
+        self._dropped = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+
+    async def stop(self, *, drain_timeout_s: float = STOP_DRAIN_TIMEOUT_S) -> None:
+        if self._tasks:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._queue.join(), drain_timeout_s)
+
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+        # Whatever didn't make it out: interrupted sends plus anything still queued
+        unsent = list(self._in_flight.values())
+        self._in_flight.clear()
+        while not self._queue.empty():
+            unsent.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if unsent:
+            logger.warning("Make forwarder stopped with %d unsent message(s)", len(unsent))
+            try:
+                await self._record_failures(unsent, "forwarder stopped before send completed")
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to record unsent Make messages")
+
+    def submit(self, payload: dict) -> None:
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # No DB write here: this runs in the Telegram handler during the very burst
+            # that filled the queue. The log line (with running count) is the record.
+            self._dropped += 1
+            self._correlations.discard(payload["correlation_id"])
+            logger.warning(
+                "Make send queue full; dropped %s (%d dropped since start)",
+                payload["correlation_id"],
+                self._dropped,
+            )
+
+    async def _worker(self) -> None:
+        while True:
+            payload = await self._queue.get()
+            correlation_id = payload["correlation_id"]
+            self._in_flight[correlation_id] = payload
+            try:
+                # Durable correlation: callbacks after a restart (or on another process)
+                # resolve via this row. The in-memory entry still covers this process.
+                try:
+                    await self._record_created(payload)
+                except Exception:  # noqa: BLE001
+                    logger.exception("Failed to persist Make correlation %s", correlation_id)
+                await self._make_client.send_incoming_message(payload)
+            except asyncio.CancelledError:
+                # Left in _in_flight: stop() records it as failed
+                self._queue.task_done()
+                raise
+            except Exception as e:  # noqa: BLE001
+                try:
+                    await self._record_failures([payload], str(e))
+                except Exception:  # noqa: BLE001
+                    logger.exception("Failed to record Make send failure")
+            self._in_flight.pop(correlation_id, None)
+            self._queue.task_done()
+
+    async def _record_created(self, payload: dict) -> None:
+        stmt = pg_insert(MakeRequest).values(
+            _request_row(payload, status=MakeRequestStatus.created)
+        )
+        async with self._session_factory() as session:
+            await session.execute(stmt.on_conflict_do_nothing(index_elements=["correlation_id"]))
+            await session.commit()
+
+    async def _record_failures(self, payloads: list[dict], error: str) -> None:
+        # Make never saw these, so no callback will come; keep DB rows for audit only.
+        for payload in payloads:
+            self._correlations.discard(payload["correlation_id"])
+        stmt = pg_insert(MakeRequest).values(
+            [
+                _request_row(payload, status=MakeRequestStatus.failed, last_error=error[:500])
+                for payload in payloads
+            ]
+        )
+        # Interrupted sends already have their "created" row; flip it to failed
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["correlation_id"],
+            set_={
+                "status": stmt.excluded.status,
+                "last_error": stmt.excluded.last_error,
+                # Column onupdate defaults don't apply to ON CONFLICT DO UPDATE
+                "updated_at": func.now(),
+            },
+        )
+        async with self._session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+
+def _request_row(payload: dict, **values) -> dict:
+    return {
+        "correlation_id": payload["correlation_id"],
+        "chat_id": payload["chat_id"],
+        "user_id": payload["user_id"] or 0,
+        "message_id": payload["message_id"],
+        **values,
+    }
+
 
 def setup_dispatcher(
     *,
-    bot: Bot,
-    session_factory: async_sessionmaker,
-    make_client: MakeClient,
+    forwarder: MakeForwarder,
+    correlations: CorrelationStore,
     public_base_url: str | None,
 ) -> Dispatcher:
     dp = Dispatcher()
@@ -39,35 +185,9 @@ def setup_dispatcher(
             "callback_url": callback_url,
         }
 
-        # Persist mapping (correlation_id -> chat_id) so callback can reply to correct chat.
-        async with session_factory() as session:
-            req = MakeRequest(
-                correlation_id=correlation_id,
-                chat_id=message.chat.id,
-                user_id=message.from_user.id if message.from_user else 0,
-                message_id=message.message_id,
-                status=MakeRequestStatus.created,
-            )
-            session.add(req)
-            await session.commit()
-            req_id = req.id
+        # Remember mapping (correlation_id -> chat_id) so callback can reply to correct chat.
+        correlations.add(correlation_id, chat_id=message.chat.id)
 
-        async def _send_background() -> None:
-            async with session_factory() as session:
-                try:
-                    await make_client.send_incoming_message(payload)
-                    req2 = await session.get(MakeRequest, req_id)
-                    if req2:
-                        req2.status = MakeRequestStatus.sent
-                        req2.last_error = None
-                    await session.commit()
-                except Exception as e:  # noqa: BLE001
-                    req2 = await session.get(MakeRequest, req_id)
-                    if req2:
-                        req2.status = MakeRequestStatus.failed
-                        req2.last_error = str(e)[:500]
-                    await session.commit()
-
-        asyncio.create_task(_send_background())
+        forwarder.submit(payload)
 
     return dp
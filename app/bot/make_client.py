@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import time
 from dataclasses import dataclass
 
 import httpx
@@ -11,27 +13,92 @@ class MakeClientConfig:
     webhook_url: str
     bearer_token: str | None = None
     timeout_s: float = 10.0
+    max_attempts: int = 3
+    # After this many consecutive failed sends, fail fast for breaker_cooldown_s
+    breaker_threshold: int = 5
+    breaker_cooldown_s: float = 30.0
+
+
+class MakeUnavailable(Exception):
+    """Make is failing repeatedly; the send was rejected without a request."""
+
+
+_shared_client: httpx.AsyncClient | None = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Process-wide client to Make: keeps connections (and HTTP/2 streams) across bot restarts.
+
+    No lock needed: creation doesn't await, so two coroutines can't race here.
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        # http2/limits must go on the transport: AsyncClient ignores them when one is given
+        _shared_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=0,
+                limits=httpx.Limits(
+                    max_keepalive_connections=64, max_connections=128, keepalive_expiry=60
+                ),
+            ),
+        )
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    """Close the shared client; call on application shutdown only."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
 
 
 class MakeClient:
-    def __init__(self, cfg: MakeClientConfig):
+    def __init__(self, cfg: MakeClientConfig, *, client: httpx.AsyncClient | None = None):
         self._cfg = cfg
-        self._client = httpx.AsyncClient(timeout=cfg.timeout_s)
-
-    async def aclose(self) -> None:
-        await self._client.aclose()
+        self._client = client if client is not None else get_shared_client()
+        self._consecutive_failures = 0
+        self._open_until = 0.0  # time.monotonic(); breaker is open before this
 
     async def send_incoming_message(self, payload: dict) -> None:
+        if time.monotonic() < self._open_until:
+            raise MakeUnavailable("Make webhook circuit is open")
+
         headers: dict[str, str] = {}
         if self._cfg.bearer_token:
             headers["Authorization"] = f"Bearer {self._cfg.bearer_token}"
 
-        for attempt in range(3):
+        for attempt in range(self._cfg.max_attempts):
             try:
-                resp = await self._client.post(self._cfg.webhook_url, json=payload, headers=headers)
+                resp = await self._client.post(
+                    self._cfg.webhook_url,
+                    json=payload,
+                    headers=headers,
+                    timeout=self._cfg.timeout_s,
+                )
                 resp.raise_for_status()
-                return
-            except (httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError):
-                if attempt == 2:
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500:
+                    if e.response.status_code >= 400:
+                        # Make is up but rejected this payload; not a reason to trip the breaker
+                        self._consecutive_failures = 0
                     raise
-                await asyncio.sleep(0.5 * (attempt + 1))
+                failure: Exception = e
+            except httpx.TransportError as e:
+                # Connect/read/write/pool timeouts, refused or dropped connections
+                failure = e
+            else:
+                self._consecutive_failures = 0
+                return
+
+            if attempt == self._cfg.max_attempts - 1:
+                self._record_failure()
+                raise failure
+            # Jittered exponential backoff so a burst of workers doesn't retry in lockstep
+            await asyncio.sleep(random.uniform(0.1, 0.5 * 2**attempt))
+
+    def _record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self._cfg.breaker_threshold:
+            self._open_until = time.monotonic() + self._cfg.breaker_cooldown_s
@@ -4,16 +4,18 @@ import asyncio
 import contextlib
 import enum
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from aiogram import Bot, Dispatcher
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.bot.dispatcher import setup_dispatcher
-from app.bot.make_client import MakeClient, MakeClientConfig
+from app.bot.correlations import CorrelationStore
+from app.bot.dispatcher import MakeForwarder, setup_dispatcher
+from app.bot.make_client import MakeClient, MakeClientConfig, close_shared_client
 from app.db.models import BotLog, BotLogLevel, BotSettings
 
 if TYPE_CHECKING:
@@ -21,6 +23,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Admin dashboards poll settings/status; serve repeated reads from memory for this long.
+SETTINGS_CACHE_TTL_S = 1.5
+
 
 class BotStatus(str, enum.Enum):
     stopped = "stopped"
@@ -53,11 +58,22 @@ class BotManager:
         self._bot: Bot | None = None
         self._dp: Dispatcher | None = None
         self._make_client: MakeClient | None = None
+        self._forwarder: MakeForwarder | None = None
         self._polling_task: asyncio.Task | None = None
+        # token -> (Bot, username); kept across stop/start so restarts reuse the warm
+        # HTTP session and skip get_me. Sessions are closed in shutdown().
+        self._bot_cache: dict[str, tuple[Bot, str | None]] = {}
+        # Outlives bot restarts so callbacks for already-forwarded messages still resolve
+        self._correlations = CorrelationStore()
         
         self._state = BotState()
         self._lock = asyncio.Lock()
 
+        # (expires_at monotonic, value); bumped generation drops in-flight fetches
+        self._settings_cache: tuple[float, BotSettings | None] | None = None
+        self._settings_cache_gen = 0
+        self._settings_cache_lock = asyncio.Lock()
+
     @property
     def state(self) -> BotState:
         return self._state
@@ -70,6 +86,25 @@ class BotManager:
     def make_client(self) -> MakeClient | None:
         return self._make_client
 
+    @property
+    def correlations(self) -> CorrelationStore:
+        return self._correlations
+
+    def webhook_url(self) -> str:
+        if not self._settings.public_base_url:
+            raise RuntimeError("PUBLIC_BASE_URL is required for webhook mode")
+        if not self._settings.tg_webhook_secret:
+            raise RuntimeError("TG_WEBHOOK_SECRET is required for webhook mode")
+        return self._settings.public_base_url.rstrip("/") + "/tg/webhook"
+
+    async def feed_webhook_update(self, update: dict) -> bool:
+        """Dispatch an update received on the webhook. Returns False if the bot is not running."""
+        bot, dp = self._bot, self._dp
+        if bot is None or dp is None or self._state.status != BotStatus.running:
+            return False
+        await dp.feed_webhook_update(bot, update)
+        return True
+
     async def _log_event(
         self,
         level: BotLogLevel,
@@ -90,17 +125,34 @@ class BotManager:
             logger.warning(f"Failed to log bot event to DB: {e}")
 
     async def get_bot_token(self) -> str | None:
-        """Get bot token from DB, fallback to settings."""
-        async with self._session_factory() as session:
-            bot_settings = await session.get(BotSettings, 1)
-            if bot_settings and bot_settings.bot_token:
-                return bot_settings.bot_token
+        """Get bot token from DB (via the settings cache), fallback to settings."""
+        bot_settings = await self.get_bot_settings()
+        if bot_settings and bot_settings.bot_token:
+            return bot_settings.bot_token
         return self._settings.bot_token if self._settings.bot_token else None
 
+    def _invalidate_settings_cache(self) -> None:
+        self._settings_cache = None
+        self._settings_cache_gen += 1
+
     async def get_bot_settings(self) -> BotSettings | None:
-        """Get bot settings from DB."""
-        async with self._session_factory() as session:
-            return await session.get(BotSettings, 1)
+        """Get bot settings from DB, cached for SETTINGS_CACHE_TTL_S."""
+        cached = self._settings_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        async with self._settings_cache_lock:
+            # Another waiter may have refreshed the cache while we were queued
+            cached = self._settings_cache
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+            gen = self._settings_cache_gen
+            async with self._session_factory() as session:
+                bot_settings = await session.get(BotSettings, 1)
+            if gen == self._settings_cache_gen:
+                self._settings_cache = (time.monotonic() + SETTINGS_CACHE_TTL_S, bot_settings)
+            return bot_settings
 
     async def update_bot_token(self, token: str) -> None:
         """Update bot token in database."""
@@ -108,25 +160,30 @@ class BotManager:
             bot_settings = await session.get(BotSettings, 1)
             if bot_settings:
                 bot_settings.bot_token = token
-                bot_settings.updated_at = datetime.now(timezone.utc)
             else:
                 bot_settings = BotSettings(id=1, bot_token=token, is_enabled=True)
                 session.add(bot_settings)
             await session.commit()
+        self._invalidate_settings_cache()
         
         await self._log_event(BotLogLevel.info, "Bot token updated")
 
     async def set_enabled(self, enabled: bool) -> None:
         """Enable or disable bot in database."""
+        # Admin UIs re-post the current state; skip the write when nothing changes
+        current = await self.get_bot_settings()
+        if current is not None and current.is_enabled == enabled:
+            return
+
         async with self._session_factory() as session:
             bot_settings = await session.get(BotSettings, 1)
             if bot_settings:
                 bot_settings.is_enabled = enabled
-                bot_settings.updated_at = datetime.now(timezone.utc)
             else:
                 bot_settings = BotSettings(id=1, is_enabled=enabled)
                 session.add(bot_settings)
             await session.commit()
+        self._invalidate_settings_cache()
 
     async def start(self) -> bool:
         """Start the bot. Returns True if started successfully."""
@@ -153,20 +210,34 @@ class BotManager:
                     await self._log_event(BotLogLevel.info, "Bot start skipped: disabled in settings")
                     return False
 
-                # Create bot instance
-                self._bot = Bot(token=token)
-                
-                # Validate token by getting bot info
-                try:
-                    bot_info = await self._bot.get_me()
-                    self._state.bot_username = bot_info.username
-                except Exception as e:
-                    await self._bot.session.close()
-                    self._bot = None
-                    self._state.status = BotStatus.error
-                    self._state.error_message = f"Invalid token: {str(e)}"
-                    await self._log_event(BotLogLevel.error, "Bot start failed: invalid token", str(e))
-                    return False
+                # Sessions for replaced tokens are no longer useful
+                for old_token in [t for t in self._bot_cache if t != token]:
+                    old_bot, _ = self._bot_cache.pop(old_token)
+                    with contextlib.suppress(Exception):
+                        await old_bot.session.close()
+
+                cached = self._bot_cache.get(token)
+                if cached is not None:
+                    self._bot, self._state.bot_username = cached
+                else:
+                    # Create bot instance
+                    self._bot = Bot(token=token)
+
+                    # Validate token by getting bot info
+                    try:
+                        bot_info = await self._bot.get_me()
+                        self._state.bot_username = bot_info.username
+                    except Exception as e:
+                        await self._bot.session.close()
+                        self._bot = None
+                        self._state.status = BotStatus.error
+                        self._state.error_message = f"Invalid token: {str(e)}"
+                        await self._log_event(
+                            BotLogLevel.error, "Bot start failed: invalid token", str(e)
+                        )
+                        return False
+
+                    self._bot_cache[token] = (self._bot, self._state.bot_username)
 
                 # Create Make client
                 self._make_client = MakeClient(
@@ -176,16 +247,30 @@ class BotManager:
                     )
                 )
 
+                self._forwarder = MakeForwarder(
+                    make_client=self._make_client,
+                    session_factory=self._session_factory,
+                    correlations=self._correlations,
+                )
+                self._forwarder.start()
+
                 # Setup dispatcher
                 self._dp = setup_dispatcher(
-                    bot=self._bot,
-                    session_factory=self._session_factory,
-                    make_client=self._make_client,
+                    forwarder=self._forwarder,
+                    correlations=self._correlations,
                     public_base_url=self._settings.public_base_url,
                 )
 
-                # Start polling
-                self._polling_task = asyncio.create_task(self._dp.start_polling(self._bot))
+                if self._settings.tg_use_webhook:
+                    # Telegram pushes updates to POST /tg/webhook; no polling task needed
+                    await self._bot.set_webhook(
+                        url=self.webhook_url(),
+                        secret_token=self._settings.tg_webhook_secret,
+                        drop_pending_updates=False,
+                    )
+                else:
+                    # Start polling
+                    self._polling_task = asyncio.create_task(self._dp.start_polling(self._bot))
                 
                 self._state.status = BotStatus.running
                 self._state.started_at = datetime.now(timezone.utc)
@@ -199,6 +284,9 @@ class BotManager:
                 return True
 
             except Exception as e:
+                if self._forwarder:
+                    await self._forwarder.stop()
+                    self._forwarder = None
                 self._state.status = BotStatus.error
                 self._state.error_message = str(e)
                 await self._log_event(BotLogLevel.error, "Bot start failed", str(e))
@@ -221,15 +309,19 @@ class BotManager:
                         await self._polling_task
                     self._polling_task = None
 
-                # Close Make client
-                if self._make_client:
-                    await self._make_client.aclose()
-                    self._make_client = None
+                if self._settings.tg_use_webhook and self._bot:
+                    with contextlib.suppress(Exception):
+                        await self._bot.delete_webhook()
+
+                if self._forwarder:
+                    await self._forwarder.stop()
+                    self._forwarder = None
+
+                # Make client shares a process-wide HTTP pool; it's closed on shutdown()
+                self._make_client = None
 
-                # Close bot session
-                if self._bot:
-                    await self._bot.session.close()
-                    self._bot = None
+                # Bot session stays open in _bot_cache for the next start()
+                self._bot = None
 
                 self._dp = None
                 self._state.status = BotStatus.stopped
@@ -249,16 +341,22 @@ class BotManager:
         await self.stop()
         return await self.start()
 
-    async def get_logs(self, limit: int = 50) -> list[BotLog]:
-        """Get recent bot logs."""
+    async def get_logs(self, limit: int = 50) -> list[Row]:
+        """Get recent bot logs as (id, level, message, details, created_at) rows."""
         async with self._session_factory() as session:
             result = await session.execute(
-                select(BotLog)
-                .order_by(BotLog.created_at.desc())
+                select(BotLog.id, BotLog.level, BotLog.message, BotLog.details, BotLog.created_at)
+                # id follows insertion order, so the PK index serves "latest N" directly
+                .order_by(BotLog.id.desc())
                 .limit(limit)
             )
-            return list(result.scalars().all())
+            return list(result.all())
 
     async def shutdown(self) -> None:
         """Clean shutdown for application exit."""
         await self.stop()
+        for bot, _ in self._bot_cache.values():
+            with contextlib.suppress(Exception):
+                await bot.session.close()
+        self._bot_cache.clear()
+        await close_shared_client()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import FrozenSet
+from functools import cached_property
+from typing import Annotated, FrozenSet
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -13,9 +14,16 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    # "prod" skips create_all at startup; the schema is managed by alembic there
+    env: str = "dev"
+
     # Telegram
     bot_token: str
     enable_bot: bool = True
+    # Receive updates via webhook at {PUBLIC_BASE_URL}/tg/webhook instead of long polling
+    tg_use_webhook: bool = False
+    # Sent by Telegram in X-Telegram-Bot-Api-Secret-Token; required in webhook mode
+    tg_webhook_secret: str | None = None
 
     # Make: incoming messages webhook (where we POST any user message)
     make_webhook_url: str
@@ -33,9 +41,20 @@ class Settings(BaseSettings):
 
     # DB
     database_url: str
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_recycle_s: int = 1800
+    # Max wait for a free connection before raising instead of queueing forever
+    db_pool_timeout_s: float = 10.0
+    db_pool_use_lifo: bool = True
+    # Connections opened at startup (capped at db_pool_size)
+    db_pool_prewarm: int = 5
 
     # bootstrap
-    admin_telegram_ids: str = ""
+    # ADMIN_TELEGRAM_IDS: comma-separated ids, parsed once at construction
+    admin_ids: Annotated[FrozenSet[int], NoDecode] = Field(
+        default_factory=frozenset, validation_alias="ADMIN_TELEGRAM_IDS"
+    )
 
     timezone: str = "Europe/Moscow"
 
@@ -43,6 +62,8 @@ class Settings(BaseSettings):
     # Directory where uploaded images are stored (mounted as /media)
     media_root: str = "media"
     media_url_prefix: str = "/media"
+    # Max concurrent photo compressions (worker threads); defaults to CPU count, min 2
+    image_compress_concurrency: int | None = None
 
     # Web admin panel (SvelteKit)
     admin_panel_password: str | None = None
@@ -52,17 +73,28 @@ class Settings(BaseSettings):
     # Comma-separated origins, e.g. "https://admin.example.com"
     admin_cors_origins: str = "https://barbershop.aidronik.com"
 
-    @property
-    def admin_ids(self) -> FrozenSet[int]:
-        ids: set[int] = set()
-        for part in self.admin_telegram_ids.split(","):
-            part = part.strip()
-            if not part:
-                continue
-            ids.add(int(part))
-        return frozenset(ids)
+    @cached_property
+    def media_base_url(self) -> str:
+        """Public prefix for media files: absolute if PUBLIC_BASE_URL is set, else relative."""
+        prefix = self.media_url_prefix.rstrip("/")
+        if self.public_base_url:
+            return self.public_base_url.rstrip("/") + prefix
+        return prefix
+
+    @field_validator("admin_ids", mode="before")
+    @classmethod
+    def _split_admin_ids(cls, v: object) -> object:
+        if isinstance(v, str):
+            return frozenset(int(p) for p in v.split(",") if p.strip())
+        return v
+
+
+_settings: Settings | None = None
 
 
-@lru_cache
 def get_settings() -> Settings:
-    return Settings()
+    # Plain global instead of lru_cache: this runs as a dependency on every request
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -0,0 +1,26 @@
+"""Helpers for data migrations.
+
+Lives next to env.py rather than in versions/: alembic treats every module in
+versions/ as a revision file and refuses ones without a `revision` id.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+
+
+def bulk_insert(
+    conn: Connection,
+    table: Table,
+    rows: Sequence[Mapping[str, Any]],
+    *,
+    batch_size: int = 1000,
+) -> None:
+    """Insert rows as executemany batches (one round-trip per batch, not per row)."""
+    for i in range(0, len(rows), batch_size):
+        conn.execute(table.insert(), rows[i : i + batch_size])
+
@@ -4,12 +4,11 @@ import asyncio
 from logging.config import fileConfig
 
 from alembic import context
-from sqlalchemy import pool
 from sqlalchemy.engine import Connection
-from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.config import get_settings
 from app.db.models import Base
+from app.db.session import create_script_engine
 
 # this is the Alembic Config object, which provides access to the values within the .ini file.
 config = context.config
@@ -45,14 +44,7 @@ def do_run_migrations(connection: Connection) -> None:
 
 
 async def run_migrations_online() -> None:
-    configuration = config.get_section(config.config_ini_section) or {}
-    configuration["sqlalchemy.url"] = get_url()
-
-    connectable = async_engine_from_config(
-        configuration,
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    connectable = create_script_engine(get_url())
 
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
@@ -0,0 +1,36 @@
+"""covering unique index on make_requests.correlation_id
+
+Revision ID: 0005_make_request_corr_covering
+Revises: 0004
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# NOTE: revision id must fit into alembic_version.version_num (usually VARCHAR(32)).
+revision = "0005_make_request_corr_covering"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build the replacement first so correlation_id stays unique throughout.
+    # CONCURRENTLY keeps make_requests writable; it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_make_requests_corr_covering '
+            'ON make_requests (correlation_id) INCLUDE (chat_id, status)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_make_requests_correlation_id')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_make_requests_correlation_id '
+            'ON make_requests (correlation_id)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_make_requests_corr_covering')
@@ -0,0 +1,44 @@
+"""drop single-column indexes covered by composites
+
+Revision ID: 0006_drop_redundant_indexes
+Revises: 0005_make_request_corr_covering
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# NOTE: revision id must fit into alembic_version.version_num (usually VARCHAR(32)).
+revision = "0006_drop_redundant_indexes"
+down_revision = "0005_make_request_corr_covering"
+branch_labels = None
+depends_on = None
+
+# Leftmost prefixes of ix_appointments_master_time / ix_appointments_customer_time /
+# ix_working_hours_master_day, or (end_at) never filtered on alone.
+# ix_appointments_start_at stays: list_appointments ranges over start_at without a master.
+_DROPPED = {
+    "ix_appointments_master_id": "appointments (master_id)",
+    "ix_appointments_customer_telegram_id": "appointments (customer_telegram_id)",
+    "ix_appointments_end_at": "appointments (end_at)",
+    "ix_working_hours_master_id": "working_hours (master_id)",
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Only declared on the model so far; databases built by migrations lack it.
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_appointments_customer_time '
+            'ON appointments (customer_telegram_id, start_at)'
+        )
+        for name in _DROPPED:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, target in _DROPPED.items():
+            op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}')
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_appointments_customer_time')
@@ -0,0 +1,83 @@
+"""exclusion constraint against overlapping booked appointments
+
+Revision ID: 0008_appointments_no_overlap
+Revises: 0006_drop_redundant_indexes
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# NOTE: revision id must fit into alembic_version.version_num (usually VARCHAR(32)).
+revision = "0008_appointments_no_overlap"
+down_revision = "0006_drop_redundant_indexes"
+branch_labels = None
+depends_on = None
+
+
+# Booked pairs the constraint would reject; the later-created one (higher id) is listed second.
+_OVERLAPS = sa.text('''
+    SELECT a.master_id, a.id AS kept_id, b.id AS conflicting_id
+    FROM appointments a
+    JOIN appointments b
+      ON b.master_id = a.master_id
+     AND b.id > a.id
+     AND tstzrange(a.start_at, a.end_at, '[)') && tstzrange(b.start_at, b.end_at, '[)')
+    WHERE a.status = 'booked' AND b.status = 'booked'
+    ORDER BY a.master_id, a.id, b.id
+    LIMIT 50
+''')
+_CONSTRAINT_EXISTS = sa.text(
+    "SELECT 1 FROM pg_constraint WHERE conname = 'appointments_no_overlap'"
+)
+
+
+def _assert_no_overlaps() -> None:
+    conn = op.get_bind()
+    if conn.scalar(_CONSTRAINT_EXISTS):
+        return
+    pairs = conn.execute(_OVERLAPS).all()
+    if not pairs:
+        return
+    listed = "\n".join(
+        f"  master {p.master_id}: appointment {p.kept_id} overlaps {p.conflicting_id}"
+        for p in pairs
+    )
+    conflicting = ", ".join(str(i) for i in sorted({p.conflicting_id for p in pairs}))
+    raise RuntimeError(
+        "Cannot add appointments_no_overlap: overlapping booked appointments exist"
+        f" ({len(pairs)} pair(s) shown, at most 50 per run):\n{listed}\n"
+        "Contact the affected customers, then cancel one side of each pair, e.g. the later"
+        " booking:\n"
+        "  UPDATE appointments SET status = 'cancelled', cancelled_at = now()"
+        f" WHERE id IN ({conflicting});\n"
+        "and re-run `alembic upgrade head` (repeat until no pairs are reported)."
+    )
+
+
+def upgrade() -> None:
+    # btree_gist provides the gist "=" operator class for master_id.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    # Report existing overlaps (the old check-then-insert race) with the ids to fix,
+    # instead of letting ADD CONSTRAINT fail with a bare exclusion error.
+    _assert_no_overlaps()
+    op.execute('''
+        DO $$ BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'appointments_no_overlap'
+            ) THEN
+                ALTER TABLE appointments
+                ADD CONSTRAINT appointments_no_overlap
+                EXCLUDE USING gist (
+                    master_id WITH =,
+                    tstzrange(start_at, end_at, '[)') WITH &&
+                ) WHERE (status = 'booked');
+            END IF;
+        END $$
+    ''')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE appointments DROP CONSTRAINT IF EXISTS appointments_no_overlap')
@@ -0,0 +1,30 @@
+"""drop ix_bot_logs_created_at
+
+Revision ID: 0009_drop_bot_logs_created_idx
+Revises: 0008_appointments_no_overlap
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# NOTE: revision id must fit into alembic_version.version_num (usually VARCHAR(32)).
+revision = "0009_drop_bot_logs_created_idx"
+down_revision = "0008_appointments_no_overlap"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Logs are read newest-first by id (primary key); nothing filters on created_at.
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_bot_logs_created_at')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_bot_logs_created_at '
+            'ON bot_logs (created_at)'
+        )
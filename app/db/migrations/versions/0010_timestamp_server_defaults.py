@@ -0,0 +1,37 @@
+"""server-side defaults for created_at / updated_at
+
+Revision ID: 0010_timestamp_server_defaults
+Revises: 0009_drop_bot_logs_created_idx
+Create Date: 2026-10-15
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# NOTE: revision id must fit into alembic_version.version_num (usually VARCHAR(32)).
+revision = "0010_timestamp_server_defaults"
+down_revision = "0009_drop_bot_logs_created_idx"
+branch_labels = None
+depends_on = None
+
+# bot_settings.updated_at and bot_logs.created_at already default to now() (0004).
+_COLUMNS = [
+    ("admins", "created_at"),
+    ("masters", "created_at"),
+    ("appointments", "created_at"),
+    ("make_requests", "created_at"),
+    ("make_requests", "updated_at"),
+]
+
+
+def upgrade() -> None:
+    # The app no longer sends these values; the NOT NULL columns need a DB default.
+    # Metadata-only change: existing rows are not rewritten.
+    for table, column in _COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()')
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT')
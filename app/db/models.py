@@ -3,7 +3,22 @@ from __future__ import annotations
 import enum
 from datetime import datetime, time
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Time
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Time,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -11,6 +26,14 @@ class Base(DeclarativeBase):
     pass
 
 
+# appointments_no_overlap compares master_id with "=" inside a gist index
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+
+
 class AppointmentStatus(str, enum.Enum):
     booked = "booked"
     cancelled = "cancelled"
@@ -21,7 +44,7 @@ class Admin(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, index=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
 
 class Master(Base):
@@ -32,18 +55,22 @@ class Master(Base):
     description: Mapped[str | None] = mapped_column(String(2000), nullable=True)
     experience_years: Mapped[int | None] = mapped_column(Integer, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    # Relative path in media storage, e.g. "masters/1.jpg" (one photo per master)
+    # Relative path in media storage, e.g. "masters/1-0123456789ab.jpg" (one photo per master)
     photo_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    working_hours: Mapped[list[WorkingHours]] = relationship(back_populates="master")  # type: ignore[name-defined]
+    # lazy="raise": load explicitly via selectinload() to avoid accidental N+1 queries.
+    # passive_deletes: the FK cascades in the DB, so deleting a master never loads its hours.
+    working_hours: Mapped[list[WorkingHours]] = relationship(  # type: ignore[name-defined]
+        back_populates="master", lazy="raise", passive_deletes=True
+    )
 
 
 class WorkingHours(Base):
     __tablename__ = "working_hours"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"), index=True)
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="CASCADE"))
     day_of_week: Mapped[int] = mapped_column(Integer)  # 0=Mon .. 6=Sun
     start_time: Mapped[time] = mapped_column(Time)
     end_time: Mapped[time] = mapped_column(Time)
@@ -59,21 +86,31 @@ class Appointment(Base):
     __tablename__ = "appointments"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    master_id: Mapped[int] = mapped_column(
-        ForeignKey("masters.id", ondelete="RESTRICT"), index=True
-    )
-    customer_telegram_id: Mapped[int] = mapped_column(BigInteger, index=True)
+    master_id: Mapped[int] = mapped_column(ForeignKey("masters.id", ondelete="RESTRICT"))
+    customer_telegram_id: Mapped[int] = mapped_column(BigInteger)
 
     start_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
-    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    end_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
     status: Mapped[AppointmentStatus] = mapped_column(
         Enum(AppointmentStatus), default=AppointmentStatus.booked
     )
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     cancelled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Closes the check-then-insert race in booking: Postgres rejects overlapping
+        # booked slots for the same master atomically (needs btree_gist for "=").
+        ExcludeConstraint(
+            (master_id, "="),
+            (func.tstzrange(start_at, end_at, text("'[)'")), "&&"),
+            name="appointments_no_overlap",
+            using="gist",
+            where=text("status = 'booked'"),
+        ),
+    )
+
 
 class MakeRequestStatus(str, enum.Enum):
     created = "created"
@@ -86,7 +123,8 @@ class MakeRequest(Base):
     __tablename__ = "make_requests"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    correlation_id: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    # Unique via ix_make_requests_corr_covering below
+    correlation_id: Mapped[str] = mapped_column(String(64))
     chat_id: Mapped[int] = mapped_column(BigInteger, index=True)
     user_id: Mapped[int] = mapped_column(BigInteger, index=True)
     message_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -94,16 +132,25 @@ class MakeRequest(Base):
     status: Mapped[MakeRequestStatus] = mapped_column(
         Enum(MakeRequestStatus), default=MakeRequestStatus.created
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
 
+# master_id / customer_telegram_id lookups use the leftmost column of these
 Index("ix_appointments_master_time", Appointment.master_id, Appointment.start_at, Appointment.end_at)
 Index("ix_appointments_customer_time", Appointment.customer_telegram_id, Appointment.start_at)
+# Covers make_callback's lookup: chat_id/status are read from the index leaf (plain
+# unique index on SQLite, where INCLUDE is not supported)
+Index(
+    "ix_make_requests_corr_covering",
+    MakeRequest.correlation_id,
+    unique=True,
+    postgresql_include=["chat_id", "status"],
+)
 
 
 class BotSettings(Base):
@@ -114,7 +161,7 @@ class BotSettings(Base):
     bot_token: Mapped[str | None] = mapped_column(String(200), nullable=True)
     is_enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
 
@@ -132,4 +179,5 @@ class BotLog(Base):
     level: Mapped[BotLogLevel] = mapped_column(Enum(BotLogLevel), default=BotLogLevel.info)
     message: Mapped[str] = mapped_column(String(1000))
     details: Mapped[str | None] = mapped_column(String(5000), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, index=True)
+    # Not indexed: "latest logs" reads order by the serial id (primary key) instead
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
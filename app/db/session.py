@@ -1,12 +1,65 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from collections.abc import AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 
-def create_engine(database_url: str) -> AsyncEngine:
-    return create_async_engine(database_url, pool_pre_ping=True)
+def create_engine(
+    database_url: str,
+    *,
+    pool_size: int = 20,
+    max_overflow: int = 10,
+    pool_recycle: int = 1800,
+    pool_timeout: float = 10.0,
+    pool_use_lifo: bool = True,
+) -> AsyncEngine:
+    # LIFO reuses the most recently returned (warm) connections; surplus ones idle
+    # at the bottom of the stack and get recycled.
+    return create_async_engine(
+        database_url,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        pool_use_lifo=pool_use_lifo,
+    )
+
+
+def create_script_engine(database_url: str) -> AsyncEngine:
+    """Engine without pooling for one-shot processes (alembic, CLI scripts)."""
+    return create_async_engine(database_url, poolclass=NullPool)
+
+
+async def prewarm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open `connections` pooled connections up front so requests don't pay connect cost."""
+    if connections <= 0:
+        return
+
+    async def _open(stack: contextlib.AsyncExitStack) -> None:
+        conn = await stack.enter_async_context(engine.connect())
+        await conn.execute(text("SELECT 1"))
+
+    # Connects (TCP, auth, asyncpg type introspection) run concurrently; every connection
+    # is held until all are open, otherwise the pool would hand back the same one.
+    # return_exceptions: let every connect settle before the stack closes what opened.
+    async with contextlib.AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(_open(stack) for _ in range(connections)), return_exceptions=True
+        )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
 
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
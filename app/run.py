@@ -8,7 +8,12 @@ import uvicorn
 def main() -> None:
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run("app.api.main:create_app", host=host, port=port, factory=True)
+    # uvloop/httptools come with uvicorn[standard]; pinned so a missing one fails loudly
+    # instead of silently falling back to asyncio/h11. Override with "auto" where
+    # uvloop is unavailable (e.g. Windows).
+    loop = os.getenv("UVICORN_LOOP", "uvloop")
+    http = os.getenv("UVICORN_HTTP", "httptools")
+    uvicorn.run("app.api.main:create_app", host=host, port=port, factory=True, loop=loop, http=http)
 
 
 if __name__ == "__main__":
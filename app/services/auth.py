@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import hmac
+
 from fastapi import Depends, Header, HTTPException, status
 
 from app.config import Settings, get_settings
 
+_BEARER = "Bearer "
+
 
 def _require_bearer(expected: str | None, authorization: str | None) -> None:
     if not expected:
@@ -11,11 +15,12 @@ def _require_bearer(expected: str | None, authorization: str | None) -> None:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Server token not configured",
         )
-    if not authorization or not authorization.startswith("Bearer "):
+    if not authorization or not authorization.startswith(_BEARER):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
 
-    token = authorization.removeprefix("Bearer ").strip()
-    if token != expected:
+    token = authorization[len(_BEARER) :].strip()
+    # Constant-time; bytes because compare_digest rejects non-ASCII str
+    if not hmac.compare_digest(token.encode(), expected.encode()):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid bearer token")
 
 
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, time
 
-from sqlalchemy import and_, select
+from sqlalchemy import Exists, and_, delete, exists, func, insert, literal_column, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import Appointment, AppointmentStatus, WorkingHours
@@ -25,6 +26,19 @@ class AppointmentNotFound(BookingError):
     pass
 
 
+# EXCLUDE constraint on appointments (see models.Appointment)
+_NO_OVERLAP_CONSTRAINT = "appointments_no_overlap"
+_EXCLUSION_VIOLATION = "23P01"
+
+
+def _is_overlap_violation(e: IntegrityError) -> bool:
+    if getattr(e.orig, "sqlstate", None) != _EXCLUSION_VIOLATION:
+        return False
+    # The SQLAlchemy adapter error wraps the asyncpg exception, which names the constraint
+    constraint = getattr(e.orig.__cause__, "constraint_name", None)
+    return constraint in (None, _NO_OVERLAP_CONSTRAINT)
+
+
 @dataclass(frozen=True)
 class CreateAppointment:
     master_id: int
@@ -33,26 +47,62 @@ class CreateAppointment:
     end_at: datetime
 
 
-async def assert_within_working_hours(
-    session: AsyncSession, *, master_id: int, start_at: datetime, end_at: datetime
+def fmt_hm(t: time) -> str:
+    return f"{t.hour:02d}:{t.minute:02d}"
+
+
+def parse_hm(s: str) -> time:
+    # Not time.fromisoformat: unpadded hours like "9:00" must keep working
+    hh, mm = s.split(":")
+    return time(int(hh), int(mm))
+
+
+async def replace_working_hours(
+    session: AsyncSession, *, master_id: int, hours: list[tuple[int, time, time]]
 ) -> None:
-    dow = start_at.weekday()  # 0..6
-    stmt = select(WorkingHours).where(
-        and_(WorkingHours.master_id == master_id, WorkingHours.day_of_week == dow)
+    """Replace a master's schedule with `hours` as (day_of_week, start, end) rows.
+
+    Several rows per day are allowed (split shifts), so this is a delete + insert
+    rather than an upsert keyed on (master_id, day_of_week).
+    """
+    old = delete(WorkingHours).where(WorkingHours.master_id == master_id)
+    if not hours:
+        await session.execute(old)
+        return
+
+    # One statement: the DELETE runs as a data-modifying CTE of the INSERT
+    await session.execute(
+        insert(WorkingHours)
+        .values(
+            [
+                {"master_id": master_id, "day_of_week": dow, "start_time": start, "end_time": end}
+                for dow, start, end in hours
+            ]
+        )
+        .add_cte(old.returning(WorkingHours.id).cte("old_hours"))
     )
-    rows = (await session.execute(stmt)).scalars().all()
-    if not rows:
-        raise OutsideWorkingHours("No working hours configured for this day")
 
-    start_t = start_at.timetz().replace(tzinfo=None)
-    end_t = end_at.timetz().replace(tzinfo=None)
 
-    ok = any((wh.start_time <= start_t and end_t <= wh.end_time) for wh in rows)
-    if not ok:
-        raise OutsideWorkingHours("Outside working hours")
+def _overlap_exists(
+    *, master_id: int, start_at: datetime, end_at: datetime, exclude_id: int | None
+) -> Exists:
+    # Spelled like the appointments_no_overlap constraint (master_id =, tstzrange &&,
+    # literal status = 'booked') so its gist index answers the probe, generic plans included.
+    existing = func.tstzrange(Appointment.start_at, Appointment.end_at, literal_column("'[)'"))
+    requested = func.tstzrange(start_at, end_at, literal_column("'[)'"))
+    conflict = exists().where(
+        and_(
+            Appointment.master_id == master_id,
+            Appointment.status == literal_column("'booked'"),
+            existing.op("&&")(requested),
+        )
+    )
+    if exclude_id is not None:
+        conflict = conflict.where(Appointment.id != exclude_id)
+    return conflict
 
 
-async def assert_no_overlap(
+async def assert_slot_available(
     session: AsyncSession,
     *,
     master_id: int,
@@ -60,20 +110,33 @@ async def assert_no_overlap(
     end_at: datetime,
     exclude_id: int | None = None,
 ) -> None:
-    # overlap if existing.start < new.end and new.start < existing.end
-    stmt = select(Appointment.id).where(
-        and_(
-            Appointment.master_id == master_id,
-            Appointment.status == AppointmentStatus.booked,
-            Appointment.start_at < end_at,
-            start_at < Appointment.end_at,
+    """Working-hours and overlap checks for a slot in a single round-trip."""
+    dow = start_at.weekday()  # 0..6
+    start_t = start_at.timetz().replace(tzinfo=None)
+    end_t = end_at.timetz().replace(tzinfo=None)
+
+    # One pass over the day's windows, reading only their bounds: NULL when the master
+    # has no hours that day, otherwise whether any window contains the slot.
+    window_fits = (
+        select(
+            func.bool_or(and_(WorkingHours.start_time <= start_t, end_t <= WorkingHours.end_time))
         )
+        .where(WorkingHours.master_id == master_id, WorkingHours.day_of_week == dow)
+        .scalar_subquery()
     )
-    if exclude_id is not None:
-        stmt = stmt.where(Appointment.id != exclude_id)
+    stmt = select(
+        window_fits.label("fits"),
+        _overlap_exists(
+            master_id=master_id, start_at=start_at, end_at=end_at, exclude_id=exclude_id
+        ).label("busy"),
+    )
+    fits, busy = (await session.execute(stmt)).one()
 
-    existing = (await session.execute(stmt)).scalars().first()
-    if existing is not None:
+    if fits is None:
+        raise OutsideWorkingHours("No working hours configured for this day")
+    if not fits:
+        raise OutsideWorkingHours("Outside working hours")
+    if busy:
         raise MasterBusy("Master is busy for this time range")
 
 
@@ -81,34 +144,41 @@ async def create_appointment(session: AsyncSession, cmd: CreateAppointment) -> A
     if cmd.end_at <= cmd.start_at:
         raise ValueError("end_at must be after start_at")
 
-    await assert_within_working_hours(
-        session, master_id=cmd.master_id, start_at=cmd.start_at, end_at=cmd.end_at
-    )
-    await assert_no_overlap(
+    await assert_slot_available(
         session, master_id=cmd.master_id, start_at=cmd.start_at, end_at=cmd.end_at
     )
 
-    appt = Appointment(
-        master_id=cmd.master_id,
-        customer_telegram_id=cmd.customer_telegram_id,
-        start_at=cmd.start_at,
-        end_at=cmd.end_at,
-        status=AppointmentStatus.booked,
-    )
-    session.add(appt)
-    await session.flush()
-    return appt
+    # Single INSERT ... RETURNING; the row comes back as an entity without a unit-of-work flush
+    try:
+        return await session.scalar(
+            insert(Appointment)
+            .values(
+                master_id=cmd.master_id,
+                customer_telegram_id=cmd.customer_telegram_id,
+                start_at=cmd.start_at,
+                end_at=cmd.end_at,
+                status=AppointmentStatus.booked,
+            )
+            .returning(Appointment)
+        )
+    except IntegrityError as e:
+        # A concurrent booking won the race after our availability check
+        if _is_overlap_violation(e):
+            raise MasterBusy("Master is busy for this time range") from e
+        raise
 
 
 async def reschedule_appointment(
     session: AsyncSession, *, appointment_id: int, start_at: datetime, end_at: datetime
 ) -> Appointment:
+    if end_at <= start_at:
+        raise ValueError("end_at must be after start_at")
+
     appt = await session.get(Appointment, appointment_id)
     if not appt or appt.status != AppointmentStatus.booked:
         raise AppointmentNotFound("Appointment not found")
 
-    await assert_within_working_hours(session, master_id=appt.master_id, start_at=start_at, end_at=end_at)
-    await assert_no_overlap(
+    await assert_slot_available(
         session,
         master_id=appt.master_id,
         start_at=start_at,
@@ -118,7 +188,12 @@ async def reschedule_appointment(
 
     appt.start_at = start_at
     appt.end_at = end_at
-    await session.flush()
+    try:
+        await session.flush()
+    except IntegrityError as e:
+        if _is_overlap_violation(e):
+            raise MasterBusy("Master is busy for this time range") from e
+        raise
     return appt
 
 
@@ -128,6 +203,8 @@ async def cancel_appointment(session: AsyncSession, *, appointment_id: int) -> A
         raise AppointmentNotFound("Appointment not found")
 
     appt.status = AppointmentStatus.cancelled
-    appt.cancelled_at = datetime.utcnow()
+    # Stamped by the DB clock in the UPDATE; the attribute is expired afterwards, so
+    # don't read it back from this instance without a refresh.
+    appt.cancelled_at = func.now()
     await session.flush()
     return appt
@@ -0,0 +1,39 @@
+"""In-process cache for the serialized GET /make/masters response.
+
+Masters change rarely while Make reads the list on every booking flow. Every write
+path that affects the list must call invalidate(). The cache is per process, so
+with several workers other processes may serve the old list for up to TTL_S.
+"""
+
+from __future__ import annotations
+
+import time
+
+TTL_S = 30.0
+
+_entry: tuple[float, bytes] | None = None  # (expires_at monotonic, JSON body)
+_generation = 0
+
+
+def get() -> bytes | None:
+    entry = _entry
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def generation() -> int:
+    return _generation
+
+
+def put(body: bytes, *, generation: int) -> None:
+    """Store body unless invalidate() ran since `generation` was read."""
+    global _entry
+    if generation == _generation:
+        _entry = (time.monotonic() + TTL_S, body)
+
+
+def invalidate() -> None:
+    global _entry, _generation
+    _entry = None
+    _generation += 1
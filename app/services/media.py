@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import secrets
+from collections.abc import Callable
 from dataclasses import dataclass
-from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from fastapi import HTTPException, status
 
 from app.config import Settings
 
+# Resolved once at import instead of on every upload
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover
+    Image = ImageOps = None
+
 
 @dataclass(frozen=True)
 class SavedImage:
-    relative_path: str  # e.g. "masters/1.jpg"
+    relative_path: str  # e.g. "masters/1-0123456789ab.jpg"
     content_type: str  # e.g. "image/jpeg"
     size_bytes: int
 
@@ -21,22 +30,38 @@ def build_public_url(settings: Settings, *, relative_path: str) -> str:
     """Build URL to a file under media_url_prefix.
 
     If PUBLIC_BASE_URL is configured, returns absolute URL, otherwise relative.
+    The prefix is computed once per Settings (see Settings.media_base_url).
     """
 
-    prefix = settings.media_url_prefix.rstrip("/")
-    rel = relative_path.lstrip("/")
-    url = f"{prefix}/{rel}"
+    return f"{settings.media_base_url}/{relative_path.lstrip('/')}"
+
 
-    if settings.public_base_url:
-        return settings.public_base_url.rstrip("/") + url
-    return url
+def _atomic_save(
+    directory: Path,
+    save_fn: Callable[[Path], None],
+    *,
+    name_for: Callable[[Path], str],
+) -> Path:
+    """Write a file via save_fn(tmp_path), then rename it to directory / name_for(tmp_path).
 
+    name_for sees the finished temp file, so the final name can depend on its content.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_path = directory / f".{secrets.token_hex(8)}.tmp"
+    try:
+        save_fn(tmp_path)
+        dst = directory / name_for(tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return dst
 
-def _atomic_write(path: Path, data: bytes) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(path.suffix + ".tmp")
-    tmp_path.write_bytes(data)
-    os.replace(tmp_path, path)
+
+def _sha1_prefix(path: Path) -> str:
+    with path.open("rb") as f:
+        digest = hashlib.file_digest(f, lambda: hashlib.sha1(usedforsecurity=False))
+    return digest.hexdigest()[:12]
 
 
 def compress_and_save_image(
@@ -44,13 +69,15 @@ def compress_and_save_image(
     *,
     master_id: int,
     content_type: str | None,
-    raw: bytes,
+    src: BinaryIO,
     max_side: int = 1024,
     jpeg_quality: int = 82,
 ) -> SavedImage:
     """Validate, compress and save uploaded image for a master.
 
-    Stores as JPEG at {media_root}/masters/{master_id}.jpg.
+    `src` is a readable binary stream positioned at the start of the upload.
+    Stores as JPEG at {media_root}/masters/{master_id}-{sha1[:12]}.jpg; the name
+    is content-addressed so the public URL can be cached as immutable.
 
     Raises HTTPException(400) on invalid image.
     """
@@ -58,17 +85,18 @@ def compress_and_save_image(
     if content_type and (not content_type.startswith("image/")):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File must be an image")
 
-    # Lazy import to keep module import lightweight
-    try:
-        from PIL import Image, ImageOps
-    except Exception as e:  # pragma: no cover
+    if Image is None:  # pragma: no cover
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Image processing is not available (Pillow is missing)",
-        ) from e
+        )
 
     try:
-        img = Image.open(BytesIO(raw))
+        img = Image.open(src)
+        if img.format == "JPEG":
+            # Let libjpeg decode at a reduced DCT scale (1/2..1/8); thumbnail() below
+            # still produces the exact size. 2x headroom keeps downscaling quality.
+            img.draft("RGB", (max_side * 2, max_side * 2))
         img = ImageOps.exif_transpose(img)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image") from e
@@ -83,15 +111,21 @@ def compress_and_save_image(
     if max(w, h) > max_side:
         img.thumbnail((max_side, max_side))
 
-    out = BytesIO()
-    img.save(out, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True)
-    data = out.getvalue()
-
-    rel = f"masters/{master_id}.jpg"
-    dst = Path(settings.media_root) / rel
-    _atomic_write(dst, data)
-
-    return SavedImage(relative_path=rel, content_type="image/jpeg", size_bytes=len(data))
+    # Encode straight into the temp file; the content hash is read back from disk
+    # (page cache) rather than keeping the encoded JPEG in memory.
+    dst = _atomic_save(
+        Path(settings.media_root) / "masters",
+        lambda p: img.save(
+            p, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True
+        ),
+        name_for=lambda p: f"{master_id}-{_sha1_prefix(p)}.jpg",
+    )
+
+    return SavedImage(
+        relative_path=f"masters/{dst.name}",
+        content_type="image/jpeg",
+        size_bytes=dst.stat().st_size,
+    )
 
 
 def delete_media_file(settings: Settings, *, relative_path: str) -> None: